@@ -0,0 +1,55 @@
+"""Бенчмарк: размер файла и скорость сохранения/загрузки для каждого кодека сжатия"""
+import contextlib
+import io
+import os
+import tempfile
+import time
+from datetime import date
+from models import *
+from manager import PetManager, CODECS_BY_EXTENSION
+
+PET_COUNT = 20000
+
+
+def build_system(pet_count: int) -> PetSystem:
+    system = PetSystem()
+    species = [Dog, Cat, Bird]
+    for i in range(1, pet_count // 3 + 2):
+        system.owners.append(Owner(i, f"Владелец {i}", f"+7999{i:07d}"))
+
+    for i in range(1, pet_count + 1):
+        owner = system.owners[i % len(system.owners)]
+        pet = species[i % 3](i, f"Питомец {i}", "Порода", i % 15, owner)
+        pet.health_records.append(HealthRecord(i, date(2024, 1, 10), "Плановый осмотр", "Ветеринар Петров"))
+        pet.vaccinations.append(Vaccination(i, "Бешенство", date(2024, 1, 15), date(2025, 1, 15)))
+        owner.pets.append(pet)
+        system.pets.append(pet)
+    return system
+
+
+def run_benchmark(system: PetSystem, directory: str):
+    extensions = [""] + list(CODECS_BY_EXTENSION)
+    print(f"{'Формат':<14}{'Размер, КБ':>12}{'Запись, с':>12}{'Чтение, с':>12}")
+    for fmt, save, load in [("json", PetManager.save_to_json, PetManager.load_from_json),
+                            ("xml", PetManager.save_to_xml, PetManager.load_from_xml)]:
+        for ext in extensions:
+            filename = os.path.join(directory, f"pets.{fmt}{ext}")
+
+            # Подавляем сообщения менеджера, чтобы не засорять таблицу
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                save(system, filename)
+                save_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                load(filename, PetSystem())
+                load_time = time.perf_counter() - start
+
+            size = os.path.getsize(filename) / 1024
+            print(f"{fmt + ext:<14}{size:>12.1f}{save_time:>12.3f}{load_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    system = build_system(PET_COUNT)
+    with tempfile.TemporaryDirectory() as directory:
+        run_benchmark(system, directory)
@@ -0,0 +1,90 @@
+"""Пул разделяемых неизменяемых данных (flyweight) для медицинской истории"""
+from collections import OrderedDict
+from datetime import date
+from typing import NamedTuple, Optional
+
+# Предельный размер каждой таблицы пула; сверх него вытесняются записи,
+# к которым дольше всего не обращались
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+
+class VaccineSchedule(NamedTuple):
+    """Запись каталога прививок: общая для всех прививок с одинаковым графиком"""
+    name: str
+    date: date
+    next_due: date
+
+
+class FlyweightPool:
+    """Хранит единственные экземпляры дат, строк и записей каталога прививок.
+
+    Все объекты пула неизменяемы, поэтому их можно безопасно разделять
+    между тысячами записей: изменение прививки заменяет ссылку на другую
+    запись каталога, а не меняет общую.
+
+    Пул только ускоряет разделение и не владеет данными: объекты моделей
+    держат собственные ссылки. Время жизни записей пула - до следующей
+    загрузки (загрузчики PetManager вызывают clear) или до вытеснения:
+    каждая таблица хранит не более max_entries записей и при переполнении
+    удаляет ту, к которой дольше всего не обращались (LRU). Вытесненная
+    запись остаётся у ссылающихся на неё объектов, но новые равные значения
+    с ней уже не разделяются.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._dates: "OrderedDict[date, date]" = OrderedDict()
+        self._iso_dates: "OrderedDict[str, date]" = OrderedDict()
+        self._strings: "OrderedDict[str, str]" = OrderedDict()
+        self._schedules: "OrderedDict[VaccineSchedule, VaccineSchedule]" = OrderedDict()
+
+    def intern_date(self, value: date) -> date:
+        result = self._lookup(self._dates, value)
+        if result is None:
+            result = self._store(self._dates, value, value)
+        return result
+
+    def date_from_iso(self, value: str) -> date:
+        """Разбирает дату ISO, используя кэш уже встречавшихся строк"""
+        result = self._lookup(self._iso_dates, value)
+        if result is None:
+            result = self._store(self._iso_dates, value, self.intern_date(date.fromisoformat(value)))
+        return result
+
+    def intern_string(self, value: str) -> str:
+        result = self._lookup(self._strings, value)
+        if result is None:
+            result = self._store(self._strings, value, value)
+        return result
+
+    def schedule(self, name: str, date: date, next_due: date) -> VaccineSchedule:
+        # Кортеж равен VaccineSchedule с теми же полями, поэтому запись
+        # каталога сама служит ключом и отдельный ключ не хранится
+        entry: Optional[VaccineSchedule] = self._lookup(self._schedules, (name, date, next_due))
+        if entry is None:
+            entry = VaccineSchedule(self.intern_string(name), self.intern_date(date),
+                                    self.intern_date(next_due))
+            self._store(self._schedules, entry, entry)
+        return entry
+
+    def clear(self):
+        """Очищает пул; уже созданные объекты сохраняют свои ссылки"""
+        self._dates.clear()
+        self._iso_dates.clear()
+        self._strings.clear()
+        self._schedules.clear()
+
+    @staticmethod
+    def _lookup(table: OrderedDict, key):
+        result = table.get(key)
+        if result is not None:
+            table.move_to_end(key)
+        return result
+
+    def _store(self, table: OrderedDict, key, value):
+        if len(table) >= self.max_entries:
+            table.popitem(last=False)
+        table[key] = value
+        return value
+
+
+default_pool = FlyweightPool()
@@ -1,5 +1,6 @@
 from models import *
 from manager import PetManager
+from search import SearchIndex
 from datetime import datetime, date
 
 if __name__ == "__main__":
@@ -56,6 +57,12 @@ if __name__ == "__main__":
     cat.set_indoor(False)
     bird.fly()
 
+    print("\nПОИСК")
+    index = SearchIndex(system)
+    for query in ["барс", "8 (999) 123-45-67", "осмотр"]:
+        found = [obj.name for obj, score in index.search(query)]
+        print(f"Поиск '{query}': {found}")
+
     print("\nСОХРАНЕНИЕ ДАННЫХ")
     # Сохраняем в JSON
     PetManager.save_to_json(system, "pets.json")
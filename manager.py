@@ -1,11 +1,66 @@
+import bz2
+import functools
+import gzip
 import json
+import lzma
+import os
 import xml.etree.ElementTree as ET
 from datetime import datetime, date
-from typing import Dict, Any
+from typing import Dict, Any, IO
 from models import *
+from flyweight import default_pool
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+
+
+# Кодеки сжатия: расширение файла -> функция открытия потока.
+# .lzma - устаревший формат LZMA_Alone, а не контейнер .xz
+CODECS_BY_EXTENSION = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".lzma": functools.partial(lzma.open, format=lzma.FORMAT_ALONE),
+}
+
+# Сигнатуры (magic bytes) сжатых файлов для определения формата при чтении
+_CODECS_BY_MAGIC = [
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+    (b"\x5d\x00\x00", lzma.open),
+]
+
+if zstd is not None:
+    CODECS_BY_EXTENSION[".zst"] = zstd.open
+    _CODECS_BY_MAGIC.append((b"\x28\xb5\x2f\xfd", zstd.open))
 
 
 class PetManager:
+    @staticmethod
+    def _open_stream(filename: str, mode: str) -> IO:
+        """Открывает файл, прозрачно сжимая или распаковывая поток.
+
+        При записи кодек выбирается по расширению (.gz, .bz2, .xz/.lzma, .zst),
+        при чтении - по сигнатуре в начале файла. Данные сжимаются и
+        распаковываются на лету, без промежуточной копии в памяти.
+        """
+        encoding = None if "b" in mode else "utf-8"
+        if "r" in mode:
+            with open(filename, "rb") as raw:
+                header = raw.read(6)
+            opener = next((op for magic, op in _CODECS_BY_MAGIC if header.startswith(magic)), None)
+        else:
+            opener = CODECS_BY_EXTENSION.get(os.path.splitext(filename)[1].lower())
+
+        if opener is None:
+            return open(filename, mode, encoding=encoding)
+        if encoding:
+            return opener(filename, mode.replace("t", "") + "t", encoding=encoding)
+        return opener(filename, mode)
+
     @staticmethod
     def to_dict(system: 'PetSystem') -> Dict[str, Any]:
         """Конвертирует всю систему животных в словарь для JSON"""
@@ -94,23 +149,23 @@ class PetManager:
 
     @staticmethod
     def save_to_json(system: 'PetSystem', filename: str):
-        """Сохраняет систему животных в JSON файл"""
+        """Сохраняет систему животных в JSON файл (со сжатием, если расширение есть в CODECS_BY_EXTENSION)"""
         data = PetManager.to_dict(system)
-        with open(filename, 'w', encoding='utf-8') as f:
+        with PetManager._open_stream(filename, 'w') as f:
             json.dump(data, f, ensure_ascii=False, indent=2, default=str)
         print(f"Данные сохранены в {filename}")
 
     @staticmethod
     def load_from_json(filename: str, system: 'PetSystem'):
-        """Загружает систему животных из JSON файла"""
-        with open(filename, 'r', encoding='utf-8') as f:
+        """Загружает систему животных из JSON файла (сжатие определяется автоматически)"""
+        with PetManager._open_stream(filename, 'r') as f:
             data = json.load(f)
         PetManager._load_from_dict(data, system)
         print(f"Данные загружены из {filename}")
 
     @staticmethod
     def save_to_xml(system: 'PetSystem', filename: str):
-        """Сохраняет систему животных в XML файл"""
+        """Сохраняет систему животных в XML файл (со сжатием, если расширение есть в CODECS_BY_EXTENSION)"""
         root = ET.Element("pet_system")
 
         # Owners
@@ -202,16 +257,19 @@ class PetManager:
                 ET.SubElement(pets_elem, "pet_id").text = str(pet.id)
 
         tree = ET.ElementTree(root)
-        tree.write(filename, encoding='utf-8', xml_declaration=True)
+        with PetManager._open_stream(filename, 'wb') as f:
+            tree.write(f, encoding='utf-8', xml_declaration=True)
         print(f"Данные сохранены в {filename}")
 
     @staticmethod
     def load_from_xml(filename: str, system: 'PetSystem'):
-        """Загружает систему животных из XML файла"""
-        tree = ET.parse(filename)
+        """Загружает систему животных из XML файла (сжатие определяется автоматически)"""
+        with PetManager._open_stream(filename, 'rb') as f:
+            tree = ET.parse(f)
         root = tree.getroot()
 
         # Clear existing data
+        default_pool.clear()
         system.owners.clear()
         system.vets.clear()
         system.shelters.clear()
@@ -262,7 +320,7 @@ class PetManager:
             # Load health records
             for hr_elem in pet_elem.find("health_records"):
                 hr_id = int(hr_elem.get("id"))
-                hr_date = date.fromisoformat(hr_elem.get("date"))
+                hr_date = default_pool.date_from_iso(hr_elem.get("date"))
                 description = hr_elem.get("description")
                 vet_name = hr_elem.get("vet_name")
 
@@ -273,8 +331,8 @@ class PetManager:
             for vac_elem in pet_elem.find("vaccinations"):
                 vac_id = int(vac_elem.get("id"))
                 vac_name = vac_elem.get("name")
-                vac_date = date.fromisoformat(vac_elem.get("date"))
-                next_due = date.fromisoformat(vac_elem.get("next_due"))
+                vac_date = default_pool.date_from_iso(vac_elem.get("date"))
+                next_due = default_pool.date_from_iso(vac_elem.get("next_due"))
 
                 vac = Vaccination(vac_id, vac_name, vac_date, next_due)
                 pet.vaccinations.append(vac)
@@ -336,6 +394,7 @@ class PetManager:
     def _load_from_dict(data: Dict[str, Any], system: 'PetSystem'):
         """Загружает данные из словаря в систему"""
         # Clear existing data
+        default_pool.clear()
         system.owners.clear()
         system.vets.clear()
         system.shelters.clear()
@@ -405,7 +464,7 @@ class PetManager:
             for hr_data in pet_data["health_records"]:
                 hr = HealthRecord(
                     hr_data["id"],
-                    date.fromisoformat(hr_data["date"]),
+                    default_pool.date_from_iso(hr_data["date"]),
                     hr_data["description"],
                     hr_data["vet_name"]
                 )
@@ -416,8 +475,8 @@ class PetManager:
                 vac = Vaccination(
                     vac_data["id"],
                     vac_data["name"],
-                    date.fromisoformat(vac_data["date"]),
-                    date.fromisoformat(vac_data["next_due"])
+                    default_pool.date_from_iso(vac_data["date"]),
+                    default_pool.date_from_iso(vac_data["next_due"])
                 )
                 pet.vaccinations.append(vac)
 
@@ -1,7 +1,11 @@
 from datetime import datetime, date
 from typing import List, Optional
+from flyweight import default_pool
 
 class Owner:
+    # Поисковый индекс, в котором зарегистрирован объект (см. search.SearchIndex)
+    _search_index = None
+
     def __init__(self, id: int, name: str, phone: str):
         self.id = id
         self.name = name
@@ -10,6 +14,8 @@ class Owner:
 
     def add_pet(self, pet: 'Pet'):
         self.pets.append(pet)
+        if self._search_index is not None:
+            self._search_index.index_pet(pet)
         print(f"Животное {pet.name} добавлено к владельцу {self.name}")
 
     def remove_pet(self, pet_id: int):
@@ -18,6 +24,8 @@ class Owner:
 
 
 class Pet:
+    _search_index = None
+
     def __init__(self, id: int, name: str, species: str, breed: str, age: int, owner: Owner):
         if age < 0:
             raise ValueError("Возраст не может быть отрицательным")
@@ -35,6 +43,8 @@ class Pet:
 
     def add_health_record(self, record: 'HealthRecord'):
         self.health_records.append(record)
+        if self._search_index is not None:
+            self._search_index.index_pet(self)
         print(f"Медицинская запись добавлена для {self.name}")
 
     def add_vaccination(self, vac: 'Vaccination'):
@@ -48,6 +58,8 @@ class Pet:
             if age < 0:
                 raise ValueError("Возраст не может быть отрицательным")
             self.age = age
+        if name and self._search_index is not None:
+            self._search_index.index_pet(self)
         print(f"Информация о животном {self.name} обновлена")
 
     def get_info(self) -> str:
@@ -87,28 +99,64 @@ class Bird(Pet):
 
 
 class HealthRecord:
+    # Дата и имя ветеринара разделяются между записями через пул (flyweight)
+    __slots__ = ("id", "date", "description", "vet_name", "_search_index")
+
     def __init__(self, id: int, date: date, description: str, vet_name: str):
         self.id = id
-        self.date = date
+        self.date = default_pool.intern_date(date)
         self.description = description
-        self.vet_name = vet_name
+        self.vet_name = default_pool.intern_string(vet_name)
+        self._search_index = None
 
     def update_description(self, new_desc: str):
         self.description = new_desc
+        if self._search_index is not None:
+            self._search_index.index_record(self)
         print(f"Описание записи обновлено: {new_desc}")
 
 
 class Vaccination:
+    """Прививка хранит только id и ссылку на общую запись каталога.
+
+    Запись каталога неизменяема: при изменении полей прививка переключается
+    на другую запись, не затрагивая остальные прививки с тем же графиком.
+    """
+    __slots__ = ("id", "_schedule")
+
     def __init__(self, id: int, name: str, date: date, next_due: date):
         self.id = id
-        self.name = name
-        self.date = date
-        self.next_due = next_due
+        self._schedule = default_pool.schedule(name, date, next_due)
 
     def update_due_date(self, new_date: date):
         self.next_due = new_date
         print(f"Следующая дата прививки {self.name} обновлена: {new_date}")
 
+    @property
+    def name(self) -> str:
+        return self._schedule.name
+
+    @name.setter
+    def name(self, value: str):
+        self._schedule = default_pool.schedule(value, self._schedule.date, self._schedule.next_due)
+
+    @property
+    def next_due(self) -> date:
+        return self._schedule.next_due
+
+    @next_due.setter
+    def next_due(self, value: date):
+        self._schedule = default_pool.schedule(self._schedule.name, self._schedule.date, value)
+
+    @property
+    def date(self) -> date:
+        return self._schedule.date
+
+    @date.setter
+    def date(self, value: 'date'):
+        # Строковая аннотация: здесь имя date уже занято самим свойством
+        self._schedule = default_pool.schedule(self._schedule.name, value, self._schedule.next_due)
+
 
 class Vet:
     def __init__(self, id: int, name: str, specialization: str):
@@ -0,0 +1,311 @@
+"""Полнотекстовый поиск по кличкам, породам, владельцам и медицинским записям"""
+import heapq
+import re
+from typing import Dict, List, Optional, Set, Tuple, Union
+from models import *
+
+_WORD_RE = re.compile(r"\w+")
+_PHONE_QUERY_RE = re.compile(r"^\+?[\d\s()\-]{4,}$")
+
+# Вес совпадения в зависимости от поля документа
+_NAME_WEIGHT = 3.0
+_OWNER_NAME_WEIGHT = 2.0
+_PHONE_WEIGHT = 3.0
+_BREED_WEIGHT = 1.0
+_DESCRIPTION_WEIGHT = 1.0
+
+# Множитель в зависимости от типа совпадения термина запроса
+_EXACT_MATCH = 3.0
+_PREFIX_MATCH = 2.0
+_INFIX_MATCH = 1.0
+
+_MIN_PREFIX = 2
+_MAX_PREFIX = 16
+_NGRAM = 3
+_INFIX_CANDIDATES = 64
+
+Document = Union[Pet, Owner]
+
+
+def normalize_text(text: str) -> str:
+    """Приводит текст к нижнему регистру и заменяет 'ё' на 'е'"""
+    return text.lower().replace("ё", "е")
+
+
+def normalize_phone(phone: str) -> str:
+    """Оставляет только цифры номера, отбрасывая код страны (+7 / 8)"""
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) == 11 and digits[0] in "78":
+        digits = digits[1:]
+    return digits
+
+
+def phone_query_variants(query: str) -> List[str]:
+    """Варианты цифр для поиска по части номера.
+
+    Ведущие +7 / 8 отбрасываются при любой длине запроса. У неполного номера
+    исходные цифры тоже сохраняются: "8123" может быть и серединой номера.
+    Полный 11-значный номер даёт один вариант - так он хранится в индексе.
+    """
+    digits = re.sub(r"\D", "", query)
+    if 1 < len(digits) < 11 and digits[0] in "78":
+        return [digits[1:], digits]
+    return [normalize_phone(digits)]
+
+
+def tokenize(text: str) -> List[str]:
+    """Разбивает текст (в том числе на кириллице) на нормализованные слова"""
+    return _WORD_RE.findall(normalize_text(text))
+
+
+class SearchIndex:
+    """Инвертированный индекс по животным и владельцам.
+
+    Индексируются Pet.name, Pet.breed, описания HealthRecord, Owner.name и
+    Owner.phone. Индекс обновляется автоматически через методы моделей
+    (update_info, add_health_record, update_description, Owner.add_pet).
+    Owner.remove_pet не меняет индекс: животное остаётся в системе, а
+    удалить его из поиска можно методом remove.
+
+    Не отслеживаются прямые присваивания атрибутов (Owner.name, Owner.phone,
+    Pet.breed и т.п.) и изменения списков в обход методов, например
+    pet.health_records.remove(...): после них нужно вызвать index_owner /
+    index_pet вручную.
+    """
+    def __init__(self, system: Optional['PetSystem'] = None):
+        # слово -> вес поля -> документы; вес документа по слову также
+        # хранится в прямом индексе _doc_terms
+        self._postings: Dict[str, Dict[float, Set[Document]]] = {}
+        self._doc_terms: Dict[Document, Dict[str, float]] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._ngrams: Dict[str, Set[str]] = {}
+        self._record_pets: Dict[HealthRecord, Pet] = {}
+        self._pet_records: Dict[Pet, List[HealthRecord]] = {}
+        if system is not None:
+            for owner in system.owners:
+                self.index_owner(owner)
+            for pet in system.pets:
+                self.index_pet(pet)
+
+    def index_owner(self, owner: 'Owner'):
+        """Добавляет владельца в индекс или переиндексирует его"""
+        terms: Dict[str, float] = {}
+        self._collect(terms, tokenize(owner.name), _OWNER_NAME_WEIGHT)
+        phone = normalize_phone(owner.phone)
+        if phone:
+            self._collect(terms, [phone], _PHONE_WEIGHT)
+        owner._search_index = self
+        self._update_document(owner, terms)
+
+    def index_pet(self, pet: 'Pet'):
+        """Добавляет животное вместе с его медицинскими записями в индекс"""
+        terms: Dict[str, float] = {}
+        self._collect(terms, tokenize(pet.name), _NAME_WEIGHT)
+        self._collect(terms, tokenize(pet.breed), _BREED_WEIGHT)
+        records = list(pet.health_records)
+        for record in records:
+            self._collect(terms, tokenize(record.description), _DESCRIPTION_WEIGHT)
+            record._search_index = self
+            self._record_pets[record] = pet
+        self._forget_records(self._pet_records.get(pet, ()), keep=set(records))
+        self._pet_records[pet] = records
+        pet._search_index = self
+        self._update_document(pet, terms)
+
+    def index_record(self, record: 'HealthRecord'):
+        """Переиндексирует животное, которому принадлежит запись"""
+        pet = self._record_pets.get(record)
+        if pet is not None:
+            self.index_pet(pet)
+
+    def remove(self, doc: Document):
+        """Удаляет животное или владельца из индекса"""
+        self._update_document(doc, {})
+        self._doc_terms.pop(doc, None)
+        doc._search_index = None
+        if isinstance(doc, Pet):
+            self._forget_records(self._pet_records.pop(doc, ()), keep=set())
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Document, float]]:
+        """Ищет животных и владельцев, возвращает пары (объект, релевантность).
+
+        Каждое слово запроса должно совпасть целиком, по префиксу или как
+        подстрока. Для запроса из одного слова более слабые виды совпадений
+        не просматриваются, если более сильные уже дают limit результатов.
+        Запрос, похожий на номер телефона, нормализуется целиком.
+        """
+        if _PHONE_QUERY_RE.match(query.strip()):
+            term_matches = [self._match_variants(phone_query_variants(query), limit)]
+        else:
+            terms = tokenize(query)
+            need = limit if len(terms) == 1 else None
+            term_matches = [self._match_tokens(term, need) for term in terms]
+        if not term_matches or not all(term_matches):
+            return []
+        if len(term_matches) == 1:
+            return self._top_matches(term_matches[0], limit)
+
+        # Перебираем документы самого редкого термина по убыванию оценки,
+        # остальные термины проверяем через прямой индекс. Перебор
+        # останавливается, когда даже максимальная оценка остальных терминов
+        # не позволит следующей группе войти в limit лучших результатов.
+        term_matches.sort(key=self._cost)
+        rest = term_matches[1:]
+        rest_bound = sum(max(match * max(self._postings[token]) for token, match in matches.items())
+                         for matches in rest)
+        top: List[Tuple[float, int, Document]] = []
+        seen: Set[Document] = set()
+        for score, docs in self._groups(term_matches[0]):
+            if len(top) >= limit and score + rest_bound <= top[0][0]:
+                break
+            for doc in docs:
+                if doc in seen:
+                    continue
+                seen.add(doc)
+                total = score
+                doc_terms = self._doc_terms[doc]
+                for matches in rest:
+                    best = 0.0
+                    for token, weight in doc_terms.items():
+                        match = matches.get(token)
+                        if match is not None and match * weight > best:
+                            best = match * weight
+                    if not best:
+                        break
+                    total += best
+                else:
+                    item = (total, id(doc), doc)
+                    if len(top) < limit:
+                        heapq.heappush(top, item)
+                    elif total > top[0][0]:
+                        heapq.heapreplace(top, item)
+
+        return [(doc, total) for total, _, doc in sorted(top, reverse=True)]
+
+    def _groups(self, matches: Dict[str, float]) -> List[Tuple[float, Set[Document]]]:
+        """Группы документов с одинаковой оценкой, по убыванию оценки"""
+        return sorted(((match * weight, docs)
+                       for token, match in matches.items()
+                       for weight, docs in self._postings[token].items()),
+                      key=lambda group: group[0], reverse=True)
+
+    def _top_matches(self, matches: Dict[str, float], limit: int) -> List[Tuple[Document, float]]:
+        # Группы просматриваются по убыванию оценки, поэтому можно
+        # остановиться, как только набрано limit результатов
+        results: Dict[Document, float] = {}
+        for score, docs in self._groups(matches):
+            for doc in docs:
+                if len(results) >= limit:
+                    return list(results.items())
+                results.setdefault(doc, score)
+        return list(results.items())
+
+    def _size(self, token: str) -> int:
+        return sum(len(docs) for docs in self._postings[token].values())
+
+    def _cost(self, matches: Dict[str, float]) -> int:
+        return sum(self._size(token) for token in matches)
+
+    def _match_variants(self, terms: List[str], need: Optional[int] = None) -> Dict[str, float]:
+        matches: Dict[str, float] = {}
+        for term in terms:
+            for token, match in self._match_tokens(term, need).items():
+                if match > matches.get(token, 0.0):
+                    matches[token] = match
+            if need is not None and self._cost(matches) >= need:
+                break
+        return matches
+
+    def _match_tokens(self, term: str, need: Optional[int] = None) -> Dict[str, float]:
+        """Находит слова словаря, совпадающие с термином запроса.
+
+        Если задан need, поиск прекращается, как только найденные слова
+        покрывают need документов: сначала точное совпадение, затем префикс,
+        затем подстрока.
+        """
+        matches: Dict[str, float] = {}
+        found = 0
+        if term in self._postings:
+            matches[term] = _EXACT_MATCH
+            found = self._size(term)
+
+        if len(term) >= _MIN_PREFIX and (need is None or found < need):
+            for token in self._prefixes.get(term[:_MAX_PREFIX], ()):
+                if token not in matches and token.startswith(term):
+                    matches[token] = _PREFIX_MATCH
+                    found += self._size(token)
+                    if need is not None and found >= need:
+                        break
+
+        if len(term) >= _NGRAM and (need is None or found < need):
+            for token in self._infix_candidates(term):
+                if token not in matches and term in token:
+                    matches[token] = _INFIX_MATCH
+                    found += self._size(token)
+                    if need is not None and found >= need:
+                        break
+        return matches
+
+    def _infix_candidates(self, term: str) -> Set[str]:
+        # Пересекаем множества триграмм от меньшего к большему и
+        # останавливаемся, когда кандидатов мало: их проверяет "term in token"
+        gram_sets = sorted((self._ngrams.get(gram, set()) for gram in self._grams(term)), key=len)
+        candidates = gram_sets[0]
+        for tokens in gram_sets[1:]:
+            if len(candidates) <= _INFIX_CANDIDATES:
+                break
+            candidates = candidates & tokens
+        return candidates
+
+    @staticmethod
+    def _collect(terms: Dict[str, float], tokens: List[str], weight: float):
+        for token in tokens:
+            if weight > terms.get(token, 0.0):
+                terms[token] = weight
+
+    @staticmethod
+    def _grams(token: str) -> Set[str]:
+        return {token[i:i + _NGRAM] for i in range(len(token) - _NGRAM + 1)}
+
+    def _forget_records(self, records, keep: Set['HealthRecord']):
+        for record in records:
+            if record not in keep and self._record_pets.pop(record, None) is not None:
+                record._search_index = None
+
+    def _update_document(self, doc: Document, terms: Dict[str, float]):
+        old_terms = self._doc_terms.get(doc, {})
+        for token, weight in old_terms.items():
+            if terms.get(token) != weight:
+                postings = self._postings[token]
+                postings[weight].discard(doc)
+                if not postings[weight]:
+                    del postings[weight]
+                if not postings and token not in terms:
+                    self._forget_token(token)
+        for token, weight in terms.items():
+            if old_terms.get(token) == weight:
+                continue
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._register_token(token)
+            postings.setdefault(weight, set()).add(doc)
+        self._doc_terms[doc] = terms
+
+    def _register_token(self, token: str):
+        for size in range(_MIN_PREFIX, min(len(token), _MAX_PREFIX) + 1):
+            self._prefixes.setdefault(token[:size], set()).add(token)
+        for gram in self._grams(token):
+            self._ngrams.setdefault(gram, set()).add(token)
+
+    def _forget_token(self, token: str):
+        del self._postings[token]
+        for size in range(_MIN_PREFIX, min(len(token), _MAX_PREFIX) + 1):
+            prefix = token[:size]
+            self._prefixes[prefix].discard(token)
+            if not self._prefixes[prefix]:
+                del self._prefixes[prefix]
+        for gram in self._grams(token):
+            self._ngrams[gram].discard(token)
+            if not self._ngrams[gram]:
+                del self._ngrams[gram]